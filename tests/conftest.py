@@ -0,0 +1,144 @@
+import functools
+import io
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from PIL import Image
+from playwright.sync_api import sync_playwright
+
+from webpage_screenshot import WebScreenshot
+
+
+@pytest.fixture
+def shot():
+    ws = WebScreenshot()
+    yield ws
+    ws.close()
+
+
+@pytest.fixture
+def validated_shot():
+    ws = WebScreenshot(validated=True)
+    yield ws
+    ws.close()
+
+
+class FakeContext:
+    """BrowserContext 替身，记录关闭、清除 Cookie 和保存 storage_state"""
+
+    def __init__(self, **options):
+        self.options = options
+        self.closed = False
+        self.cookies_cleared = 0
+        self.saved = []
+        self.save_error = None
+
+    def close(self):
+        self.closed = True
+
+    def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    def storage_state(self, path):
+        if self.save_error is not None:
+            raise self.save_error
+        self.saved.append(path)
+
+
+class AsyncFakeContext(FakeContext):
+    async def close(self):
+        FakeContext.close(self)
+
+    async def clear_cookies(self):
+        FakeContext.clear_cookies(self)
+
+    async def storage_state(self, path):
+        FakeContext.storage_state(self, path)
+
+
+@pytest.fixture
+def fake_contexts(monkeypatch):
+    """让实例的同步/异步 API 新建替身上下文而不启动浏览器，返回按创建顺序记录上下文的列表"""
+    def install(ws):
+        created = []
+
+        def new_context(browser, **options):
+            created.append(FakeContext(**options))
+            return created[-1]
+
+        async def new_context_async(browser, **options):
+            created.append(AsyncFakeContext(**options))
+            return created[-1]
+
+        monkeypatch.setattr(ws, "_get_browser", lambda: None)
+        monkeypatch.setattr(ws, "_new_context", new_context)
+        monkeypatch.setattr(ws, "_new_context_async", new_context_async)
+        return created
+
+    return install
+
+
+@pytest.fixture(scope="session")
+def browser_available():
+    """未安装 Chromium 时跳过需要真实浏览器的测试"""
+    with sync_playwright() as p:
+        installed = Path(p.chromium.executable_path).exists()
+    if not installed:
+        pytest.skip("未安装 Chromium（运行 playwright install chromium）")
+
+
+SITE_PAGES = {
+    "index.html": """<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>测试页面</title>
+  <meta name="description" content="页面描述">
+  <link rel="stylesheet" href="/style.css">
+</head>
+<body>
+  <h1>主<b>标题</b></h1>
+  <p>正文 <a href="#">链接</a>。</p>
+  <img src="/pixel.png" alt="像素" width="1" height="1">
+</body>
+</html>""".encode(),
+    "gbk.html": """<!doctype html>
+<html>
+<head><meta charset="gb2312"><title>中文编码</title></head>
+<body><p>简体中文页面</p></body>
+</html>""".encode("gbk"),
+    "style.css": b"body { margin: 0; }",
+}
+
+
+class _SiteHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def site(tmp_path_factory):
+    """本地静态站点，server.requested 记录收到的请求路径"""
+    root = tmp_path_factory.mktemp("site")
+    for name, body in SITE_PAGES.items():
+        (root / name).write_bytes(body)
+    buf = io.BytesIO()
+    Image.new("RGB", (1, 1), "red").save(buf, "PNG")
+    (root / "pixel.png").write_bytes(buf.getvalue())
+
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(_SiteHandler, directory=str(root))
+    )
+    server.requested = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
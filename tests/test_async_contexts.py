@@ -0,0 +1,65 @@
+"""异步视口上下文的引用计数和 LRU 淘汰"""
+import asyncio
+
+from webpage_screenshot import MAX_VIEWPORT_CONTEXTS
+
+
+def _viewport(width):
+    return {"width": width, "height": 600}
+
+
+def test_async_viewport_context_refcount(shot, fake_contexts):
+    fake_contexts(shot)
+
+    async def run():
+        viewport = _viewport(800)
+        ctx = await shot._get_async_viewport_context(None, viewport)
+        assert await shot._get_async_viewport_context(None, viewport) is ctx
+        assert shot._async_ctx_refs[(800, 600)] == 2
+
+        # 还有其他使用者时不清除 Cookie
+        await shot._release_async_viewport_context(viewport)
+        assert ctx.cookies_cleared == 0
+        await shot._release_async_viewport_context(viewport)
+        assert ctx.cookies_cleared == 1
+        assert (800, 600) not in shot._async_ctx_refs
+
+    asyncio.run(run())
+
+
+def test_async_viewport_context_eviction_skips_busy(shot, fake_contexts):
+    fake_contexts(shot)
+
+    async def run():
+        # 最久未使用的上下文仍在使用中，超出上限时不能被关闭
+        busy = await shot._get_async_viewport_context(None, _viewport(100))
+        idle = []
+        for width in range(200, 200 + MAX_VIEWPORT_CONTEXTS):
+            idle.append(await shot._get_async_viewport_context(None, _viewport(width)))
+            await shot._release_async_viewport_context(_viewport(width))
+
+        assert not busy.closed
+        assert (100, 600) in shot._async_ctx_by_viewport
+        assert idle[0].closed
+        assert len(shot._async_ctx_by_viewport) == MAX_VIEWPORT_CONTEXTS
+
+        # 归还后成为空闲上下文，再次超出上限时按最久未使用顺序淘汰
+        await shot._release_async_viewport_context(_viewport(100))
+        await shot._get_async_viewport_context(None, _viewport(999))
+        assert busy.closed
+
+    asyncio.run(run())
+
+
+def test_release_after_browser_restart_skips_dropped_context(shot, fake_contexts):
+    fake_contexts(shot)
+
+    async def run():
+        ctx = await shot._get_async_viewport_context(None, _viewport(800))
+        # 浏览器断开重启时缓存被清空，进行中的抓取归还时只递减引用计数
+        shot._async_ctx_by_viewport.clear()
+        await shot._release_async_viewport_context(_viewport(800))
+        assert ctx.cookies_cleared == 0
+        assert not shot._async_ctx_refs
+
+    asyncio.run(run())
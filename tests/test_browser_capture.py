@@ -0,0 +1,106 @@
+"""需要真实浏览器的测试：页面内脚本、资源拦截和同步抓取（未安装 Chromium 时跳过）"""
+import time
+
+import pytest
+from PIL import Image
+
+from webpage_screenshot import EXTRACT_JS, LAZY_LOAD_JS, WebScreenshot
+
+
+@pytest.fixture(scope="module")
+def ws(browser_available):
+    ws = WebScreenshot()
+    yield ws
+    ws.close()
+
+
+@pytest.fixture
+def blank_page(ws):
+    ctx = ws._acquire_context("about:blank", 800, 600)
+    page = ws._new_page(ctx, 800, 600, 10000)
+    yield page
+    ws._release_context(ctx)
+
+
+def test_extract_js_collects_page_content(blank_page):
+    blank_page.set_content(
+        '<!doctype html><html><head><title>标题</title>'
+        '<meta name="description" content="描述"><meta property="og:type" content="article">'
+        '<meta name="keywords" content=""></head>'
+        '<body><h2>副</h2><h1>主<b>标题</b></h1><h3> </h3>'
+        '<p>正文 <a href="#">链接</a>。</p>'
+        '<img src="/a.png" alt="A" width="10"><img alt="无链接"></body></html>'
+    )
+
+    data = blank_page.evaluate(EXTRACT_JS, True)
+
+    assert data["title"] == "标题"
+    assert data["meta"] == {"description": "描述", "og:type": "article"}
+    assert data["headings"] == {"h1": ["主标题"], "h2": ["副"]}
+    assert data["images"] == [{"src": "/a.png", "alt": "A", "width": "10", "height": ""}]
+    assert "正文 链接。" in data["text"]
+    assert data["html"].startswith("<!DOCTYPE html>")
+    # 使用响应原文时跳过 DOM 序列化
+    assert blank_page.evaluate(EXTRACT_JS, False)["html"] == ""
+
+
+def test_lazy_load_js_scrolls_to_bottom_and_back(blank_page):
+    blank_page.set_content(
+        '<body style="margin:0"><div style="height:5000px"></div><script>'
+        'window.maxY = 0;'
+        'addEventListener("scroll", () => { maxY = Math.max(maxY, scrollY); });'
+        '</script></body>'
+    )
+
+    blank_page.evaluate(LAZY_LOAD_JS, [20, 50, 3])
+
+    assert blank_page.evaluate("maxY") >= 5000 - 600
+    assert blank_page.evaluate("scrollY") == 0
+
+
+def test_lazy_load_js_ignores_images_outside_viewport(blank_page):
+    # 隐藏的懒加载图片永远不会加载，不能等满 maxImageWaits 轮
+    blank_page.set_content(
+        '<body><div style="display:none">'
+        '<img loading="lazy" src="https://example.invalid/x.png"></div></body>'
+    )
+
+    start = time.monotonic()
+    blank_page.evaluate(LAZY_LOAD_JS, [50, 50, 100])
+
+    assert time.monotonic() - start < 2
+
+
+def test_capture_full_text_only_blocks_subresources(ws, site):
+    site.requested.clear()
+
+    content = ws.capture_full(f"{site.url}/index.html", "", text_only=True)
+
+    assert content.title == "测试页面"
+    assert content.screenshot_path == ""
+    assert "/index.html" in site.requested
+    assert "/style.css" not in site.requested
+    assert "/pixel.png" not in site.requested
+
+
+def test_capture_full_screenshot_and_raw_html(ws, site, tmp_path):
+    path = tmp_path / "new" / "gbk.png"
+
+    content = ws.capture_full(f"{site.url}/gbk.html", str(path), full_page=False, raw_html=True)
+
+    assert ws.flush() is True
+    assert content.title == "中文编码"
+    # 原文按 <meta charset> 解码，而不是严格 UTF-8
+    assert "简体中文页面" in content.html
+    assert content.screenshot_path == str(path)
+    with Image.open(path) as image:
+        assert image.format == "PNG"
+
+
+def test_capture_writes_into_missing_directory(ws, site, tmp_path):
+    path = tmp_path / "out" / "new" / "x.jpg"
+
+    assert ws.capture(f"{site.url}/index.html", str(path), full_page=False, image_format="jpeg")
+    assert ws.flush() is True
+    with Image.open(path) as image:
+        assert image.format == "JPEG"
@@ -0,0 +1,59 @@
+"""需要真实浏览器的测试：异步抓取（截图与内容提取并发）和批量抓取（未安装 Chromium 时跳过）"""
+import asyncio
+
+import pytest
+from PIL import Image
+
+from webpage_screenshot import WebScreenshot
+
+
+@pytest.fixture(autouse=True)
+def _require_browser(browser_available):
+    pass
+
+
+def test_capture_full_async_gathers_screenshot_and_content(site, tmp_path):
+    path = tmp_path / "index.png"
+
+    async def run():
+        async with WebScreenshot() as ws:
+            return await ws.capture_full_async(
+                f"{site.url}/index.html", str(path), scroll_delay=0.05
+            )
+
+    content = asyncio.run(run())
+
+    assert content.title == "测试页面"
+    assert content.headings == {"h1": ["主标题"]}
+    assert content.images[0].src == "/pixel.png"
+    assert content.screenshot_path == str(path)
+    with Image.open(path) as image:
+        assert image.format == "PNG"
+
+
+def test_capture_full_async_text_only_skips_screenshot(site):
+    async def run():
+        async with WebScreenshot() as ws:
+            return await ws.capture_full_async(f"{site.url}/index.html", "", text_only=True)
+
+    site.requested.clear()
+    content = asyncio.run(run())
+
+    assert content.title == "测试页面"
+    assert content.screenshot_path == ""
+    assert "/pixel.png" not in site.requested
+
+
+def test_capture_many_writes_every_screenshot(site, tmp_path):
+    with WebScreenshot() as ws:
+        results = ws.capture_many(
+            [f"{site.url}/index.html", f"{site.url}/gbk.html"],
+            str(tmp_path),
+            full_page=False,
+            image_format="webp",
+        )
+
+    assert [content.title for content in results] == ["测试页面", "中文编码"]
+    for i in range(2):
+        with Image.open(tmp_path / f"{i:05d}.webp") as image:
+            assert image.format == "WEBP"
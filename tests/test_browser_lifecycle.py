@@ -0,0 +1,120 @@
+"""浏览器断开后的重启和关闭时的状态清理（使用替身对象，不启动真实浏览器）"""
+import asyncio
+
+import pytest
+
+import webpage_screenshot
+from webpage_screenshot import PlaywrightError
+
+
+class FakeBrowser:
+    def __init__(self, connected=True, close_error=None):
+        self.connected = connected
+        self.close_error = close_error
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.closed = True
+        if self.close_error is not None:
+            raise self.close_error
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.stopped = False
+
+    def start(self):
+        return self
+
+    def stop(self):
+        self.stopped = True
+
+
+class AsyncFakeBrowser(FakeBrowser):
+    async def close(self):
+        FakeBrowser.close(self)
+
+
+class AsyncFakePlaywright(FakePlaywright):
+    async def start(self):
+        return self
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def launched(shot, monkeypatch):
+    """让 _get_browser 启动替身浏览器，返回已启动的浏览器列表"""
+    browsers = []
+
+    def launch(playwright):
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+
+    monkeypatch.setattr(webpage_screenshot, "sync_playwright", FakePlaywright)
+    monkeypatch.setattr(shot, "_launch_browser", launch)
+    yield browsers
+    shot._browser = None
+
+
+def test_get_browser_reuses_connected_browser(shot, launched):
+    assert shot._get_browser() is shot._get_browser()
+    assert len(launched) == 1
+
+
+def test_get_browser_relaunches_after_disconnect(shot, launched):
+    first = shot._get_browser()
+    old_pw = shot._pw
+    shot._ctx_by_viewport[(800, 600)] = object()
+    first.connected = False
+    first.close_error = PlaywrightError("Target closed")
+
+    second = shot._get_browser()
+
+    assert second is not first
+    assert old_pw.stopped
+    assert not shot._ctx_by_viewport
+
+
+def test_close_browser_resets_state_when_close_fails(shot, launched):
+    shot._get_browser().close_error = PlaywrightError("Target closed")
+    pw = shot._pw
+
+    with pytest.raises(PlaywrightError):
+        shot._close_browser()
+
+    assert shot._browser is None
+    assert shot._owner_thread is None
+    assert pw.stopped
+
+
+def test_get_async_browser_relaunches_after_disconnect(shot, monkeypatch):
+    browsers = []
+
+    async def launch(playwright):
+        browsers.append(AsyncFakeBrowser())
+        return browsers[-1]
+
+    monkeypatch.setattr(webpage_screenshot, "async_playwright", AsyncFakePlaywright)
+    monkeypatch.setattr(shot, "_launch_browser", launch)
+
+    async def run():
+        first = await shot._get_async_browser()
+        old_pw = shot._async_pw
+        shot._async_ctx_by_viewport[(800, 600)] = object()
+        first.connected = False
+
+        second = await shot._get_async_browser()
+        assert second is not first
+        assert first.closed and old_pw.stopped
+        assert not shot._async_ctx_by_viewport
+
+        await shot.aclose()
+        assert second.closed
+        assert shot._async_browser is None
+
+    asyncio.run(run())
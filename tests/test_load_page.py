@@ -0,0 +1,56 @@
+"""页面加载的等待策略（使用替身页面，不启动真实浏览器）"""
+import asyncio
+
+import pytest
+
+
+class FakePage:
+    def __init__(self):
+        self.waits = []
+
+    def goto(self, url, wait_until):
+        self.waits.append(wait_until)
+
+    def wait_for_selector(self, selector, state):
+        self.waits.append(selector)
+
+    def wait_for_load_state(self, state, timeout=None):
+        self.waits.append(state)
+
+
+class AsyncFakePage(FakePage):
+    async def goto(self, url, wait_until):
+        FakePage.goto(self, url, wait_until)
+
+    async def wait_for_selector(self, selector, state):
+        FakePage.wait_for_selector(self, selector, state)
+
+    async def wait_for_load_state(self, state, timeout=None):
+        FakePage.wait_for_load_state(self, state, timeout)
+
+
+CASES = [
+    # full_page, ready_selector, screenshot, 期望的等待顺序
+    (False, None, True, ["domcontentloaded", "load"]),
+    (False, None, False, ["domcontentloaded"]),
+    (False, "#app", True, ["domcontentloaded", "#app"]),
+    (True, None, True, ["domcontentloaded", "networkidle"]),
+]
+
+
+@pytest.mark.parametrize("full_page, ready_selector, screenshot, expected", CASES)
+def test_load_page_waits(shot, full_page, ready_selector, screenshot, expected):
+    page = FakePage()
+    shot._load_page(page, "https://example.com/", 0, full_page, 0, ready_selector, screenshot)
+
+    assert page.waits == expected
+
+
+@pytest.mark.parametrize("full_page, ready_selector, screenshot, expected", CASES)
+def test_load_page_async_waits(shot, full_page, ready_selector, screenshot, expected):
+    page = AsyncFakePage()
+    asyncio.run(shot._load_page_async(
+        page, "https://example.com/", 0, full_page, 0, ready_selector, screenshot
+    ))
+
+    assert page.waits == expected
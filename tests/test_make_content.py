@@ -0,0 +1,62 @@
+"""由提取结果构建 WebPageContent"""
+import msgspec
+import pytest
+
+from webpage_screenshot import ImageInfo, ImageInfoFast, WebPageContent
+
+CONTENT_FIELDS = dict(
+    screenshot_path="x.png",
+    url="https://example.com/",
+    title="标题",
+    text_content="正文",
+    html="<html></html>",
+    meta={},
+    headings={},
+)
+
+
+def test_make_content_builds_images(shot):
+    content = shot._make_content(
+        [{"src": "/a.png", "alt": "A", "width": "1", "height": "2"}], **CONTENT_FIELDS
+    )
+
+    assert content.images == [ImageInfo(src="/a.png", alt="A", width="1", height="2")]
+    assert content.title == "标题"
+
+
+def test_make_content_unvalidated_skips_validation(shot):
+    # 未开启 validated 时不做类型校验，原样保存
+    content = shot._make_content([], **{**CONTENT_FIELDS, "title": 123})
+
+    assert content.title == 123
+
+
+def test_make_content_validated_builds_images(validated_shot):
+    content = validated_shot._make_content(
+        [{"src": "/a.png", "alt": "A", "width": "1", "height": "2"}], **CONTENT_FIELDS
+    )
+
+    assert content.images == [ImageInfo(src="/a.png", alt="A", width="1", height="2")]
+    assert content.title == "标题"
+
+
+def test_make_content_validated_rejects_bad_images(validated_shot):
+    with pytest.raises(msgspec.ValidationError):
+        validated_shot._make_content([{"src": 1}], **CONTENT_FIELDS)
+    with pytest.raises(msgspec.ValidationError):
+        validated_shot._make_content([{"alt": "缺少 src"}], **CONTENT_FIELDS)
+
+
+def test_make_content_validated_fills_image_defaults(validated_shot):
+    content = validated_shot._make_content([{"src": "/a.png"}], **CONTENT_FIELDS)
+
+    assert content.images == [ImageInfo(src="/a.png")]
+
+
+def test_from_fast_validates_other_fields():
+    images = [ImageInfoFast(src="/a.png")]
+    content = WebPageContent.from_fast(images, **CONTENT_FIELDS)
+
+    assert content.images == [ImageInfo(src="/a.png")]
+    with pytest.raises(ValueError):
+        WebPageContent.from_fast(images, **{**CONTENT_FIELDS, "title": 123})
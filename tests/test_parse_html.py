@@ -0,0 +1,84 @@
+"""静态 HTML 解析（parse_html / _parse_tree）"""
+from webpage_screenshot import ImageInfo, WebPageContent
+
+SAMPLE_HTML = """<!doctype html>
+<html>
+<head>
+  <title> 示例页面 </title>
+  <meta name="description" content="页面描述">
+  <meta name="keywords" content="">
+  <meta property="og:title" content="OG 标题">
+  <meta name="robots" content="noindex">
+  <style>body { color: red; }</style>
+</head>
+<body>
+  <h2>副标题</h2>
+  <h1>主<b>标题</b></h1>
+  <h3>   </h3>
+  <p>正文内容</p>
+  <img src="/a.png" alt="图A" width="100" height="50">
+  <img src="/b.png">
+  <img alt="无链接">
+  <script>var hidden = "脚本内容";</script>
+  <template><p>模板内容</p></template>
+</body>
+</html>"""
+
+
+def test_parse_html_fields(shot):
+    content = shot.parse_html(SAMPLE_HTML, url="https://example.com/", screenshot_path="x.png")
+
+    assert isinstance(content, WebPageContent)
+    assert content.url == "https://example.com/"
+    assert content.screenshot_path == "x.png"
+    assert content.title == "示例页面"
+    assert content.html == SAMPLE_HTML
+
+
+def test_parse_html_meta_skips_empty_and_unlisted(shot):
+    content = shot.parse_html(SAMPLE_HTML)
+
+    assert content.meta == {"description": "页面描述", "og:title": "OG 标题"}
+
+
+def test_parse_html_images_require_src(shot):
+    content = shot.parse_html(SAMPLE_HTML)
+
+    assert [img.src for img in content.images] == ["/a.png", "/b.png"]
+    assert content.images[0] == ImageInfo(src="/a.png", alt="图A", width="100", height="50")
+    assert content.images[1] == ImageInfo(src="/b.png")
+
+
+def test_parse_html_headings_sorted_and_non_empty(shot):
+    content = shot.parse_html(SAMPLE_HTML)
+
+    assert list(content.headings) == ["h1", "h2"]
+    assert content.headings["h1"] == ["主标题"]
+    assert content.headings["h2"] == ["副标题"]
+
+
+def test_parse_html_text_excludes_script_style_template(shot):
+    content = shot.parse_html(SAMPLE_HTML)
+
+    assert "正文内容" in content.text_content
+    assert "脚本内容" not in content.text_content
+    assert "color: red" not in content.text_content
+    assert "模板内容" not in content.text_content
+
+
+def test_parse_html_text_breaks_only_at_blocks(shot):
+    content = shot.parse_html(
+        "<body><p>Hello <a>world</a>, foo<i>bar</i>.</p>\n  <div>上<br>下 &amp;\n 尾</div>"
+        "<ul><li>一</li><li>二</li></ul></body>"
+    )
+
+    assert content.text_content == "Hello world, foobar.\n上\n下 & 尾\n一\n二"
+
+
+def test_parse_html_empty_document(shot):
+    content = shot.parse_html("")
+
+    assert content.title == ""
+    assert content.meta == {}
+    assert content.images == []
+    assert content.headings == {}
@@ -0,0 +1,51 @@
+"""raw_html 模式下主文档响应体的解码"""
+import pytest
+
+from webpage_screenshot import WebScreenshot
+
+HTML = "<html><head><title>中文标题</title></head><body>正文</body></html>"
+
+
+@pytest.mark.parametrize("charset", ["gbk", "GB2312", "gb18030"])
+def test_decode_body_uses_content_type_charset(charset):
+    body = HTML.encode("gb18030")
+
+    assert WebScreenshot._decode_body(body, f"text/html; charset={charset}") == HTML
+
+
+def test_decode_body_uses_meta_charset():
+    html = '<html><head><meta charset="Shift_JIS"><title>日本語</title></head></html>'
+
+    assert WebScreenshot._decode_body(html.encode("shift_jis"), "text/html") == html
+
+
+def test_decode_body_http_equiv_meta():
+    html = (
+        '<meta http-equiv="Content-Type" content="text/html; charset=gb2312">'
+        "<title>中文</title>"
+    )
+
+    assert WebScreenshot._decode_body(html.encode("gbk"), "text/html") == html
+
+
+def test_decode_body_latin1_uses_windows_1252():
+    body = "café €".encode("cp1252")
+
+    assert WebScreenshot._decode_body(body, "text/html; charset=ISO-8859-1") == "café €"
+
+
+def test_decode_body_defaults_to_utf8():
+    assert WebScreenshot._decode_body(HTML.encode(), "text/html") == HTML
+
+
+def test_decode_body_replaces_invalid_bytes():
+    # 未声明编码的 GBK 页面不再抛出 UnicodeDecodeError
+    body = HTML.encode("gbk")
+
+    html = WebScreenshot._decode_body(body, "text/html")
+    assert "�" in html
+    assert html.startswith("<html><head><title>")
+
+
+def test_decode_body_unknown_charset_falls_back_to_utf8():
+    assert WebScreenshot._decode_body(HTML.encode(), "text/html; charset=x-unknown") == HTML
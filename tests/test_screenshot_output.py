@@ -0,0 +1,62 @@
+"""截图参数和后台写入"""
+import asyncio
+
+import pytest
+
+from webpage_screenshot import DEFAULT_JPEG_QUALITY
+
+
+def test_screenshot_options_png(shot):
+    assert shot._screenshot_options(True, "png", None) == {
+        "full_page": True,
+        "animations": "disabled",
+        "scale": "device",
+        "type": "png",
+    }
+
+
+@pytest.mark.parametrize("quality, expected", [(None, DEFAULT_JPEG_QUALITY), (55, 55), (0, 0)])
+def test_screenshot_options_jpeg(shot, quality, expected):
+    options = shot._screenshot_options(False, "jpeg", quality)
+
+    assert options["type"] == "jpeg"
+    assert options["quality"] == expected
+    assert options["full_page"] is False
+
+
+def test_write_screenshot_creates_parent_dirs(shot, tmp_path):
+    path = tmp_path / "out" / "new" / "x.png"
+    shot._write_screenshot(str(path), b"data")
+
+    assert shot.flush() is True
+    assert path.read_bytes() == b"data"
+
+
+def test_flush_reports_write_failure(shot, tmp_path):
+    (tmp_path / "file").write_text("")
+    shot._write_screenshot(str(tmp_path / "ok.png"), b"data")
+    # 父路径是普通文件，无法创建目录
+    shot._write_screenshot(str(tmp_path / "file" / "bad.png"), b"data")
+
+    assert shot.flush() is False
+    assert (tmp_path / "ok.png").read_bytes() == b"data"
+    # 失败的写入只报告一次
+    assert shot.flush() is True
+
+
+def test_capture_many_async_fails_items_whose_write_failed(shot, tmp_path, monkeypatch):
+    (tmp_path / "file").write_text("")
+
+    async def fake_capture(url, output_path, **kwargs):
+        if url == "bad":
+            output_path = str(tmp_path / "file" / "bad.png")
+        return url, shot._write_screenshot(output_path, b"data")[1]
+
+    monkeypatch.setattr(shot, "_capture_full_async", fake_capture)
+
+    results = asyncio.run(shot.capture_many_async(["ok", "bad"], str(tmp_path / "out")))
+
+    assert results == ["ok", None]
+    assert (tmp_path / "out" / "00000.png").read_bytes() == b"data"
+    # 已处理的写入不再留给 flush()
+    assert shot._pending_writes == []
@@ -0,0 +1,122 @@
+"""按域名复用上下文和 storage_state 持久化"""
+import asyncio
+
+import pytest
+
+from webpage_screenshot import MAX_HOST_CONTEXTS, WebScreenshot
+
+
+@pytest.fixture
+def stored(tmp_path):
+    ws = WebScreenshot(storage_dir=str(tmp_path / "state"))
+    yield ws
+    ws.close()
+
+
+def test_storage_dir_implies_host_contexts(stored):
+    assert stored.host_contexts is True
+
+
+def test_storage_state_disabled_without_storage_dir(shot):
+    assert shot._storage_state_path("example.com") is None
+    assert shot._claim_storage_save("https://example.com/") is None
+
+
+def test_storage_state_file_replaces_port_colon(stored):
+    assert stored._storage_state_file("example.com:8080") == stored.storage_dir / "example.com_8080.json"
+
+
+def test_storage_state_path_requires_existing_file(stored):
+    assert stored._storage_state_path("example.com") is None
+    stored.storage_dir.mkdir()
+    (stored.storage_dir / "example.com.json").write_text("{}")
+    assert stored._storage_state_path("example.com") == str(stored.storage_dir / "example.com.json")
+
+
+def test_claim_storage_save_once_per_host(stored):
+    storage_dir = stored.storage_dir
+    assert stored._claim_storage_save("https://example.com/a") == storage_dir / "example.com.json"
+    assert storage_dir.is_dir()
+    # 同一域名的后续页面不再保存
+    assert stored._claim_storage_save("https://example.com/b") is None
+    assert stored._claim_storage_save("https://other.com:8443/") == storage_dir / "other.com_8443.json"
+
+
+def test_save_storage_state_failure_unclaims_host(stored, fake_contexts):
+    fake_contexts(stored)
+    ctx = stored._acquire_context("https://example.com/", 800, 600)
+    ctx.save_error = OSError("disk full")
+
+    # 保存失败不抛出，下次抓取同一域名时重试
+    stored._save_storage_state(ctx, "https://example.com/a")
+    ctx.save_error = None
+    stored._save_storage_state(ctx, "https://example.com/b")
+    stored._save_storage_state(ctx, "https://example.com/c")
+
+    assert ctx.saved == [stored.storage_dir / "example.com.json"]
+
+
+def test_save_storage_state_async_failure_unclaims_host(stored, fake_contexts):
+    fake_contexts(stored)
+
+    async def run():
+        ctx = await stored._get_async_host_context(None, "https://example.com/")
+        ctx.save_error = OSError("disk full")
+        await stored._save_storage_state_async(ctx, "https://example.com/a")
+        ctx.save_error = None
+        await stored._save_storage_state_async(ctx, "https://example.com/b")
+        return ctx
+
+    ctx = asyncio.run(run())
+    assert ctx.saved == [stored.storage_dir / "example.com.json"]
+
+
+def test_host_context_loads_saved_storage_state(stored, fake_contexts):
+    created = fake_contexts(stored)
+    stored.storage_dir.mkdir()
+    (stored.storage_dir / "example.com.json").write_text("{}")
+
+    stored._acquire_context("https://example.com/", 800, 600)
+    stored._acquire_context("https://other.com/", 800, 600)
+
+    assert created[0].options["storage_state"] == str(stored.storage_dir / "example.com.json")
+    assert created[1].options["storage_state"] is None
+
+
+def test_host_contexts_are_lru_capped(stored, fake_contexts):
+    created = fake_contexts(stored)
+    first = stored._acquire_context("https://site0.com/", 800, 600)
+    for i in range(1, MAX_HOST_CONTEXTS + 1):
+        # 保持 site0 为最近使用
+        assert stored._acquire_context("https://site0.com/", 800, 600) is first
+        stored._acquire_context(f"https://site{i}.com/", 800, 600)
+
+    assert len(stored._ctx_by_host) == MAX_HOST_CONTEXTS
+    assert not first.closed
+    assert created[1].closed
+    assert "site1.com" not in stored._ctx_by_host
+
+
+def test_async_host_contexts_skip_busy_on_eviction(stored, fake_contexts):
+    fake_contexts(stored)
+
+    async def run():
+        busy = await stored._get_async_host_context(None, "https://busy.com/")
+        idle = []
+        for i in range(MAX_HOST_CONTEXTS):
+            url = f"https://site{i}.com/"
+            idle.append(await stored._get_async_host_context(None, url))
+            await stored._release_async_host_context(url)
+
+        # 最久未使用的上下文仍在使用中，不能被关闭
+        assert not busy.closed
+        assert idle[0].closed
+        assert len(stored._async_ctx_by_host) == MAX_HOST_CONTEXTS
+        # 域名上下文归还时保留 Cookie
+        assert busy.cookies_cleared == 0
+
+        await stored._release_async_host_context("https://busy.com/")
+        await stored._get_async_host_context(None, "https://new.com/")
+        assert busy.closed
+
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+"""webp 截图输出"""
+import io
+
+from PIL import Image
+
+from webpage_screenshot import WEBP_MAX_DIMENSION, WEBP_SOURCE_JPEG_QUALITY
+
+
+def _jpeg(width, height):
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), "white").save(buf, "JPEG", quality=WEBP_SOURCE_JPEG_QUALITY)
+    return buf.getvalue()
+
+
+def test_screenshot_options_webp_captures_lossless_jpeg(shot):
+    # webp 由浏览器先输出高质量 jpeg，质量参数留给后台转码使用
+    options = shot._screenshot_options(True, "webp", 30)
+
+    assert options["type"] == "jpeg"
+    assert options["quality"] == WEBP_SOURCE_JPEG_QUALITY
+
+
+def test_write_screenshot_encodes_webp(shot, tmp_path):
+    path, _ = shot._write_screenshot(str(tmp_path / "x.webp"), _jpeg(200, 100), "webp", 0)
+
+    assert shot.flush() is True
+    assert path == str(tmp_path / "x.webp")
+    with Image.open(path) as image:
+        assert image.format == "WEBP"
+        assert image.size == (200, 100)
+
+
+def test_write_screenshot_falls_back_to_jpeg_beyond_webp_limit(shot, tmp_path):
+    data = _jpeg(16, WEBP_MAX_DIMENSION + 1)
+    path, _ = shot._write_screenshot(str(tmp_path / "long.webp"), data, "webp", None)
+
+    assert shot.flush() is True
+    assert path == str(tmp_path / "long.jpg")
+    assert not (tmp_path / "long.webp").exists()
+    with Image.open(path) as image:
+        assert image.format == "JPEG"
+        assert image.size == (16, WEBP_MAX_DIMENSION + 1)
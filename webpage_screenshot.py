@@ -4,13 +4,197 @@
 功能：支持完整页面截图、自定义视口、延迟加载等
 """
 
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout, ViewportSize
+from playwright.sync_api import sync_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeout, ViewportSize
+from playwright.async_api import async_playwright
+from selectolax.lexbor import LexborHTMLParser
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import httpx
+import io
+import logging
+import msgspec
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
 import time
 from pathlib import Path
-from typing import Optional
+from PIL import Image
+from typing import Literal, Optional
+from urllib.parse import urlparse
 from pydantic import BaseModel, Field
 
 
+logger = logging.getLogger("webshot")
+
+# 默认并发数上限
+MAX_POOL_SIZE = 8
+
+# 每个浏览器按视口缓存的 BrowserContext 数量上限（超出时淘汰最久未使用的）
+MAX_VIEWPORT_CONTEXTS = 4
+# 开启 host_contexts 时按域名缓存的 BrowserContext 数量上限（超出时淘汰最久未使用的）
+MAX_HOST_CONTEXTS = 16
+
+# 资源类型白名单预设（Playwright request.resource_type），不在白名单中的请求会被拦截
+# 仅截图：保留图片和样式，跳过字体、媒体和 WebSocket
+SCREENSHOT_RESOURCES = frozenset({"document", "script", "stylesheet", "image", "xhr", "fetch"})
+# 仅文本：只加载文档和脚本
+TEXT_ONLY_RESOURCES = frozenset({"document", "script", "xhr", "fetch"})
+
+# 完整截图未指定 ready_selector 时等待网络空闲的超时时间（毫秒）
+NETWORK_IDLE_TIMEOUT = 5000
+
+# launch_shared_server 等待 Chromium 远程调试端口就绪的默认超时时间（秒）
+SHARED_SERVER_STARTUP_TIMEOUT = 10
+
+# 截图格式为 jpeg / webp 且未指定质量时使用的默认质量
+DEFAULT_JPEG_QUALITY = 80
+DEFAULT_WEBP_QUALITY = 80
+
+# webp 截图先由浏览器输出高质量 jpeg，再在后台线程转码
+WEBP_SOURCE_JPEG_QUALITY = 100
+# WebP 图片宽高上限（像素），超出时改存为 jpeg
+WEBP_MAX_DIMENSION = 16383
+
+# 截图格式对应的文件扩展名
+IMAGE_SUFFIXES = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+
+# 静态 HTML 快速通道使用的 User-Agent
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36"
+)
+
+# 静态 HTML 正文少于该字符数时视为需要 JS 渲染
+MIN_STATIC_TEXT_LENGTH = 200
+
+# 静态解析提取文本时前后换行的块级元素，其余元素的文本直接相连（与 innerText 的分行一致）
+BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "caption", "dd", "details",
+    "dialog", "div", "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form",
+    "h1", "h2", "h3", "h4", "h5", "h6", "header", "hgroup", "hr", "li", "main", "nav",
+    "ol", "option", "p", "pre", "section", "summary", "table", "tbody", "td", "tfoot",
+    "th", "thead", "tr", "ul",
+})
+# 文本节点内的连续空白（含源码换行）压缩为一个空格
+WHITESPACE_RE = re.compile(r"\s+")
+
+# 从 Content-Type 响应头和文档开头的 <meta> 中识别 HTML 编码
+CONTENT_TYPE_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+# 浏览器按 WHATWG 编码标准把这些标签当作其超集解码
+CHARSET_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "iso-8859-1": "cp1252", "latin1": "cp1252"}
+
+# 滚动到底后等待视口内图片加载完成的最大轮数（每轮 scroll_delay）
+LAZY_IMAGE_WAIT_STEPS = 10
+
+# 懒加载触发脚本：在页面内逐屏滚动，无法继续滚动时结束；到底后在有限轮数内
+# 等待视口内的图片加载完成，最后回到顶部
+LAZY_LOAD_JS = """
+async ([delay, maxScrolls, maxImageWaits]) => {
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    // 只统计与视口相交且尚未加载完成的图片；从未进入视口的懒加载图片
+    // （隐藏菜单、display:none 的标签页、横向轮播等）永远不会加载，不能等待
+    const pendingVisibleImages = () => [...document.images].filter((img) => {
+        if (img.complete) return false;
+        const rect = img.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0
+            && rect.bottom > 0 && rect.top < window.innerHeight
+            && rect.right > 0 && rect.left < window.innerWidth;
+    }).length;
+
+    for (let i = 0; i < maxScrolls; i++) {
+        const last = window.scrollY;
+        window.scrollBy(0, window.innerHeight);
+        await sleep(delay);
+        // 无法继续滚动（已到底且页面没有继续增长）时结束
+        if (window.scrollY === last) break;
+    }
+
+    for (let i = 0; i < maxImageWaits && pendingVisibleImages() > 0; i++) {
+        await sleep(delay);
+    }
+
+    window.scrollTo(0, 0);
+    await new Promise((resolve) => requestAnimationFrame(resolve));
+}
+"""
+
+# 页面内容提取脚本：一次遍历 DOM 收集标题、文本、HTML、meta、图片和标题结构
+# 参数 includeHtml 为 false 时跳过 DOM 序列化（HTML 改用响应原文）
+EXTRACT_JS = """
+(includeHtml) => {
+    const meta = {};
+    // 常见 meta 标签
+    for (const name of ['description', 'keywords', 'author', 'viewport']) {
+        const el = document.querySelector(`meta[name="${name}"]`);
+        const content = el && el.getAttribute('content');
+        if (content) meta[name] = content;
+    }
+    // Open Graph 标签
+    for (const el of document.querySelectorAll('meta[property^="og:"]')) {
+        const prop = el.getAttribute('property');
+        const content = el.getAttribute('content');
+        if (prop && content) meta[prop] = content;
+    }
+
+    // 只保存有 src 的图片
+    const images = [];
+    for (const img of document.querySelectorAll('img')) {
+        const src = img.getAttribute('src') || '';
+        if (src) {
+            images.push({
+                src,
+                alt: img.getAttribute('alt') || '',
+                width: img.getAttribute('width') || '',
+                height: img.getAttribute('height') || '',
+            });
+        }
+    }
+
+    // 标题结构 (h1-h6)，按级别排列
+    const byTag = {};
+    for (const el of document.querySelectorAll('h1, h2, h3, h4, h5, h6')) {
+        const text = el.innerText.trim();
+        if (text) {
+            const tag = el.tagName.toLowerCase();
+            (byTag[tag] = byTag[tag] || []).push(text);
+        }
+    }
+    const headings = {};
+    for (const tag of ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']) {
+        if (byTag[tag]) headings[tag] = byTag[tag];
+    }
+
+    let html = '';
+    if (includeHtml) {
+        const doctype = document.doctype
+            ? new XMLSerializer().serializeToString(document.doctype)
+            : '';
+        html = doctype + document.documentElement.outerHTML;
+    }
+
+    return {
+        url: location.href,
+        title: document.title,
+        text: document.body ? document.body.innerText : '',
+        html,
+        meta,
+        images,
+        headings,
+    };
+}
+"""
+
+# 创建上下文时通过 add_init_script 注册提取函数，每次导航后由浏览器自动注入，
+# 抓取时只需发送一行调用脚本，不必每次传输并重新编译完整的 EXTRACT_JS
+EXTRACT_INIT_JS = f"window.__webshotExtract = {EXTRACT_JS.strip()};"
+EXTRACT_CALL_JS = "(includeHtml) => window.__webshotExtract(includeHtml)"
+
+
 class ImageInfo(BaseModel):
     """图片信息"""
     src: str = Field(description="图片链接")
@@ -19,6 +203,14 @@ class ImageInfo(BaseModel):
     height: str = Field(default="", description="图片高度")
 
 
+class ImageInfoFast(msgspec.Struct, frozen=True):
+    """图片信息（msgspec 结构体，用于批量解码和校验，在 API 边界转换为 ImageInfo）"""
+    src: str
+    alt: str = ""
+    width: str = ""
+    height: str = ""
+
+
 class WebPageContent(BaseModel):
     """网页内容数据模型"""
     screenshot_path: str = Field(description="截图保存路径")
@@ -30,6 +222,28 @@ class WebPageContent(BaseModel):
     images: list[ImageInfo] = Field(default_factory=list, description="图片列表")
     headings: dict[str, list[str]] = Field(default_factory=dict, description="标题结构 {h1: [...], h2: [...]}")
 
+    @classmethod
+    def from_fast(cls, images: list[ImageInfoFast], **fields) -> "WebPageContent":
+        """
+        由 ImageInfoFast 列表构建 WebPageContent
+
+        Args:
+            images: 已由 msgspec 校验过的图片列表
+            **fields: 其余字段（仍经过 Pydantic 校验）
+
+        Returns:
+            WebPageContent: 页面内容数据模型
+        """
+        return cls(
+            images=[
+                ImageInfo.model_construct(
+                    src=img.src, alt=img.alt, width=img.width, height=img.height
+                )
+                for img in images
+            ],
+            **fields,
+        )
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -45,19 +259,607 @@ class WebPageContent(BaseModel):
         }
 
 
+class SharedBrowserServer:
+    """launch_shared_server 启动的共享 Chromium 进程"""
+
+    def __init__(self, process: subprocess.Popen, endpoint: str, user_data_dir: str):
+        """
+        Args:
+            process: Chromium 进程
+            endpoint: CDP 地址（传给 WebScreenshot 的 cdp_endpoint）
+            user_data_dir: 临时用户数据目录，close() 时删除
+        """
+        self.process = process
+        self.endpoint = endpoint
+        self.user_data_dir = user_data_dir
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """终止 Chromium 进程并删除临时用户数据目录"""
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
 class WebScreenshot:
-    """网页截图工具类"""
+    """
+    网页截图工具类
+
+    同步接口（capture / capture_full）使用的浏览器由首次调用它们的线程独占：
+    Playwright 同步 API 的对象不能跨线程使用，在其他线程调用会抛出 RuntimeError，
+    close() 也必须在该线程中调用。需要并发时请使用 capture_many / capture_many_async，
+    或为每个线程创建独立的 WebScreenshot 实例。
+    """
 
-    def __init__(self, headless: bool = True, browser_type: str = "chromium"):
+    def __init__(
+        self,
+        headless: bool = True,
+        browser_type: str = "chromium",
+        pool_size: Optional[int] = None,
+        validated: bool = False,
+        cdp_endpoint: Optional[str] = None,
+        host_contexts: bool = False,
+        storage_dir: Optional[str] = None,
+    ):
         """
         初始化截图工具
 
         Args:
             headless: 是否使用无头模式
             browser_type: 浏览器类型 ("chromium", "firefox", "webkit")
+            pool_size: capture_many 的默认并发数（默认 min(CPU 核数, MAX_POOL_SIZE)）
+            validated: 是否校验提取结果（图片列表由 msgspec 批量校验，其余字段由 Pydantic
+                       校验；默认跳过校验，提取脚本和解析器产出的字段已经是字符串）
+            cdp_endpoint: 已运行的 Chromium 的 CDP 地址（如 "http://localhost:9222"），
+                          指定后连接该浏览器而不是启动新的浏览器进程，
+                          可配合 launch_shared_server 在多个进程间共享同一个浏览器
+            host_contexts: 同一域名的页面复用同一个 BrowserContext（保留 Cookie、
+                           连接和缓存），适合批量抓取同一站点的多个页面；最多缓存
+                           MAX_HOST_CONTEXTS 个域名，超出时关闭最久未使用的上下文
+            storage_dir: 按域名保存 storage_state（Cookie、localStorage）的目录，
+                         下次运行时用于预热上下文；指定后隐含 host_contexts=True
         """
         self.headless = headless
         self.browser_type = browser_type
+        self.pool_size = pool_size or min(os.cpu_count() or 1, MAX_POOL_SIZE)
+        self.validated = validated
+        self.cdp_endpoint = cdp_endpoint
+        self.storage_dir = Path(storage_dir) if storage_dir else None
+        self.host_contexts = host_contexts or self.storage_dir is not None
+        # 已保存过 storage_state 的域名
+        self._saved_hosts: set[str] = set()
+        self._saved_hosts_lock = threading.Lock()
+        # 同步浏览器及其缓存的上下文，由首次启动浏览器的线程独占
+        self._pw = None
+        self._browser = None
+        self._ctx_by_viewport: OrderedDict = OrderedDict()
+        self._ctx_by_host: OrderedDict = OrderedDict()
+        self._owner_thread: Optional[int] = None
+        self._browser_lock = threading.Lock()
+        self._http: Optional[httpx.Client] = None
+        self._http_lock = threading.Lock()
+        # 截图文件在后台线程写入，与下一次页面加载重叠
+        self._writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="webshot-writer")
+        self._pending_writes: list[Future] = []
+        self._writes_lock = threading.Lock()
+        # 异步 API 的浏览器绑定在创建它的事件循环上
+        self._reset_async_state(None)
+
+    @classmethod
+    def launch_shared_server(
+        cls,
+        port: int = 9222,
+        headless: bool = True,
+        startup_timeout: float = SHARED_SERVER_STARTUP_TIMEOUT,
+    ) -> SharedBrowserServer:
+        """
+        启动一个开启远程调试端口的 Chromium 进程，供多个 WebScreenshot 实例共享，
+        等到 CDP 端口可以连接后才返回
+
+        Args:
+            port: 远程调试端口
+            headless: 是否使用无头模式
+            startup_timeout: 等待端口就绪的超时时间（秒）
+
+        Returns:
+            SharedBrowserServer: 共享浏览器进程，endpoint 传给 cdp_endpoint，
+                                 不再需要时调用其 close()（或用 with 语句）
+
+        Raises:
+            RuntimeError: Chromium 提前退出或在超时时间内未就绪
+        """
+        with sync_playwright() as p:
+            executable = p.chromium.executable_path
+
+        # 远程调试要求使用非默认的用户数据目录
+        user_data_dir = tempfile.mkdtemp(prefix="webshot-chromium-")
+        args = [
+            executable,
+            f"--remote-debugging-port={port}",
+            f"--user-data-dir={user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ]
+        if headless:
+            args.append("--headless=new")
+
+        process = subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        server = SharedBrowserServer(process, f"http://127.0.0.1:{port}", user_data_dir)
+
+        # 轮询 /json/version，直到 Chromium 开始监听
+        deadline = time.monotonic() + startup_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                server.close()
+                raise RuntimeError(f"Chromium 启动失败（退出码 {process.returncode}）")
+            try:
+                if httpx.get(f"{server.endpoint}/json/version", timeout=1).is_success:
+                    return server
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+
+        server.close()
+        raise RuntimeError(f"Chromium 远程调试端口 {port} 在 {startup_timeout} 秒内未就绪")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+        self.close()
+
+    async def aclose(self):
+        """关闭异步浏览器并停止异步 Playwright"""
+        try:
+            if self._async_loop is asyncio.get_running_loop():
+                async with self._async_lock:
+                    if self._async_browser is not None:
+                        await self._discard_async_browser()
+        finally:
+            self._reset_async_state(None)
+
+    def _reset_async_state(self, loop: Optional[asyncio.AbstractEventLoop]):
+        """丢弃异步浏览器相关状态，并将其绑定到指定的事件循环"""
+        self._async_loop = loop
+        self._async_pw = None
+        self._async_browser = None
+        self._async_ctx_by_host: OrderedDict = OrderedDict()
+        self._async_ctx_by_viewport: OrderedDict = OrderedDict()
+        # 各缓存上下文（键为域名或视口尺寸）正在进行的抓取数，为 0 时才可淘汰或清除 Cookie
+        self._async_ctx_refs: dict[str | tuple[int, int], int] = {}
+        # asyncio.Lock 会绑定到首次等待时的事件循环，每个事件循环使用新锁
+        self._async_lock = asyncio.Lock()
+
+    async def _get_async_browser(self):
+        """首次使用时启动异步 Playwright 和浏览器，之后在同一事件循环内复用"""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # 换了事件循环（如多次 asyncio.run）时旧连接已不可用，丢弃后重新启动
+            if self._async_browser is not None:
+                logger.warning("异步浏览器所在的事件循环已结束且未调用 aclose()，将重新启动浏览器")
+            self._reset_async_state(loop)
+
+        async with self._async_lock:
+            if self._async_browser is not None and not self._async_browser.is_connected():
+                logger.warning("⚠️ 异步浏览器连接已断开（崩溃或被关闭），将重新启动浏览器")
+                try:
+                    await self._discard_async_browser()
+                except PlaywrightError:
+                    pass  # 已断开的浏览器关闭失败不影响重新启动
+            if self._async_browser is None:
+                pw = await async_playwright().start()
+                try:
+                    self._async_browser = await self._launch_browser(pw)
+                except BaseException:
+                    await pw.stop()
+                    raise
+                self._async_pw = pw
+            return self._async_browser
+
+    async def _discard_async_browser(self):
+        """清空异步浏览器及其上下文缓存后关闭旧浏览器（调用方需持有 _async_lock）"""
+        browser, pw = self._async_browser, self._async_pw
+        self._async_browser = None
+        self._async_pw = None
+        self._async_ctx_by_host = OrderedDict()
+        # 引用计数保留，正在进行的抓取归还时仍需递减
+        self._async_ctx_by_viewport = OrderedDict()
+        try:
+            await browser.close()
+        finally:
+            await pw.stop()
+
+    def close(self):
+        """等待截图写入完成，关闭同步浏览器和 HTTP 客户端"""
+        self.flush()
+        self._close_browser()
+        with self._http_lock:
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+
+    def flush(self) -> bool:
+        """
+        等待所有后台截图写入完成
+
+        Returns:
+            bool: 是否全部写入成功
+        """
+        with self._writes_lock:
+            pending, self._pending_writes = self._pending_writes, []
+
+        ok = True
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                # 包括 webp 转码时 Pillow 抛出的 DecompressionBombError、ValueError 等
+                logger.error("❌ 错误: 截图写入失败 %s", e)
+                ok = False
+        return ok
+
+    def _write_screenshot(
+        self,
+        output_path: str,
+        data: bytes,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+    ) -> tuple[str, Future]:
+        """
+        提交截图字节到后台线程写入磁盘（webp 格式在后台线程中转码）
+
+        Returns:
+            tuple[str, Future]: 实际写入路径和写入任务；宽或高超出 WEBP_MAX_DIMENSION 的
+                                webp 截图无法编码，改存为同名 .jpg 文件
+        """
+        if image_format == "webp":
+            with Image.open(io.BytesIO(data)) as image:
+                size = image.size
+            if max(size) > WEBP_MAX_DIMENSION:
+                # 浏览器输出的 webp 源图本身就是 jpeg，直接写入
+                output_path = str(Path(output_path).with_suffix(".jpg"))
+                image_format = "jpeg"
+                logger.warning(
+                    "⚠️ 截图尺寸 %sx%s 超出 WebP 上限 %spx，改存为 JPEG: %s",
+                    *size, WEBP_MAX_DIMENSION, output_path,
+                )
+        future = self._writer.submit(
+            self._save_screenshot, output_path, data, image_format, quality
+        )
+        with self._writes_lock:
+            self._pending_writes.append(future)
+        return output_path, future
+
+    def _forget_writes(self, futures: list[Future]):
+        """从待写入列表中移除调用方已自行等待并处理结果的写入任务"""
+        done = set(futures)
+        with self._writes_lock:
+            self._pending_writes = [f for f in self._pending_writes if f not in done]
+
+    @classmethod
+    def _save_screenshot(
+        cls, output_path: str, data: bytes, image_format: str, quality: Optional[int]
+    ):
+        """保存截图，与 page.screenshot(path=...) 一样自动创建缺失的父目录"""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        if image_format == "webp":
+            cls._encode_webp(
+                output_path, data, DEFAULT_WEBP_QUALITY if quality is None else quality
+            )
+        else:
+            Path(output_path).write_bytes(data)
+
+    @staticmethod
+    def _encode_webp(output_path: str, data: bytes, quality: int):
+        """把浏览器输出的截图转码为 webp 并保存"""
+        with Image.open(io.BytesIO(data)) as image:
+            image.save(output_path, "WEBP", quality=quality, method=4)
+
+    def _screenshot_options(
+        self,
+        full_page: bool,
+        image_format: str,
+        quality: Optional[int],
+    ) -> dict:
+        """构造 page.screenshot 的参数（不含 path，截图以字节返回）"""
+        options = dict(
+            full_page=full_page,
+            animations="disabled",
+            scale="device",
+            type=image_format,
+        )
+        if image_format == "jpeg":
+            options["quality"] = DEFAULT_JPEG_QUALITY if quality is None else quality
+        elif image_format == "webp":
+            # 浏览器不支持直接输出 webp
+            options["type"] = "jpeg"
+            options["quality"] = WEBP_SOURCE_JPEG_QUALITY
+        return options
+
+    def _check_owner_thread(self):
+        """同步浏览器已由其他线程启动时抛出 RuntimeError"""
+        owner = self._owner_thread
+        if owner is not None and owner != threading.get_ident():
+            raise RuntimeError(
+                "WebScreenshot 的同步浏览器只能在启动它的线程中使用；"
+                "多线程请为每个线程创建独立实例，或使用 capture_many / capture_many_async"
+            )
+
+    def _close_browser(self):
+        """关闭同步浏览器（含缓存的上下文）并停止 Playwright"""
+        with self._browser_lock:
+            if self._browser is None:
+                return
+            self._check_owner_thread()
+            self._discard_browser()
+
+    def _discard_browser(self):
+        """清空同步浏览器状态后关闭旧浏览器和 Playwright（调用方需持有 _browser_lock）"""
+        browser, pw = self._browser, self._pw
+        self._browser = None
+        self._pw = None
+        self._ctx_by_viewport = OrderedDict()
+        self._ctx_by_host = OrderedDict()
+        self._owner_thread = None
+        try:
+            browser.close()
+        finally:
+            pw.stop()
+
+    def _get_browser(self):
+        """首次使用时启动 Playwright 和浏览器，之后复用同一个浏览器实例（断开后重新启动）"""
+        with self._browser_lock:
+            self._check_owner_thread()
+            if self._browser is not None and not self._browser.is_connected():
+                logger.warning("⚠️ 浏览器连接已断开（崩溃或被关闭），将重新启动浏览器")
+                try:
+                    self._discard_browser()
+                except PlaywrightError:
+                    pass  # 已断开的浏览器关闭失败不影响重新启动
+            if self._browser is None:
+                pw = sync_playwright().start()
+                try:
+                    self._browser = self._launch_browser(pw)
+                except BaseException:
+                    pw.stop()
+                    raise
+                self._pw = pw
+                self._owner_thread = threading.get_ident()
+            return self._browser
+
+    def _get_http(self) -> httpx.Client:
+        """首次使用时创建共享的 HTTP 客户端（线程安全，可跨线程复用）"""
+        with self._http_lock:
+            if self._http is None:
+                self._http = httpx.Client(
+                    http2=True,
+                    follow_redirects=True,
+                    headers={"User-Agent": USER_AGENT},
+                )
+            return self._http
+
+    def _acquire_context(self, url: str, viewport_width: int, viewport_height: int):
+        """
+        获取一个 BrowserContext：开启 host_contexts 时返回该域名专用的上下文，
+        否则返回该视口尺寸缓存的上下文，没有时新建
+        """
+        browser = self._get_browser()
+        if self.host_contexts:
+            host = urlparse(url).netloc
+            return self._get_cached_context(
+                self._ctx_by_host, host, MAX_HOST_CONTEXTS,
+                lambda: self._new_context(
+                    browser, storage_state=self._storage_state_path(host)
+                ),
+            )
+
+        return self._get_cached_context(
+            self._ctx_by_viewport, (viewport_width, viewport_height), MAX_VIEWPORT_CONTEXTS,
+            lambda: self._new_context(
+                browser,
+                viewport=ViewportSize(width=viewport_width, height=viewport_height),
+            ),
+        )
+
+    @staticmethod
+    def _get_cached_context(cache: OrderedDict, key, limit: int, create):
+        """从 LRU 缓存取上下文，没有时调用 create 新建，超出 limit 时关闭最久未使用的上下文"""
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        cache[key] = create()
+        # 同步 API 下被淘汰的上下文都已归还，可以直接关闭
+        while len(cache) > limit:
+            _, stale = cache.popitem(last=False)
+            stale.close()
+        return cache[key]
+
+    def _new_context(self, browser, **kwargs):
+        """新建 BrowserContext 并注册页面内容提取函数"""
+        ctx = browser.new_context(**kwargs)
+        ctx.add_init_script(EXTRACT_INIT_JS)
+        return ctx
+
+    async def _new_context_async(self, browser, **kwargs):
+        """_new_context 的异步版本"""
+        ctx = await browser.new_context(**kwargs)
+        await ctx.add_init_script(EXTRACT_INIT_JS)
+        return ctx
+
+    def _release_context(self, ctx):
+        """关闭上下文中的页面并清除 Cookie，上下文留在缓存中供下次复用"""
+        for page in ctx.pages:
+            page.close()
+        # 域名上下文保持打开并保留状态
+        if self.host_contexts:
+            return
+        ctx.clear_cookies()
+
+    def _storage_state_path(self, host: str) -> Optional[str]:
+        """返回域名已保存的 storage_state 文件路径，不存在时返回 None"""
+        if self.storage_dir is None:
+            return None
+        path = self._storage_state_file(host)
+        return str(path) if path.exists() else None
+
+    def _storage_state_file(self, host: str) -> Path:
+        """域名对应的 storage_state 文件（端口中的冒号替换为下划线）"""
+        return self.storage_dir / f"{host.replace(':', '_')}.json"
+
+    def _claim_storage_save(self, url: str) -> Optional[Path]:
+        """
+        首次成功抓取某域名时返回其 storage_state 保存路径，之后返回 None
+        """
+        if self.storage_dir is None:
+            return None
+        host = urlparse(url).netloc
+        with self._saved_hosts_lock:
+            if host in self._saved_hosts:
+                return None
+            self._saved_hosts.add(host)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        return self._storage_state_file(host)
+
+    def _unclaim_storage_save(self, url: str):
+        """保存失败时撤销 _claim_storage_save 的登记，下次成功抓取该域名时重试"""
+        with self._saved_hosts_lock:
+            self._saved_hosts.discard(urlparse(url).netloc)
+
+    def _save_storage_state(self, ctx, url: str):
+        """
+        首次成功抓取某域名后把上下文的 storage_state 保存到磁盘
+
+        保存失败只记录日志，不影响已经成功的抓取结果。
+        """
+        path = self._claim_storage_save(url)
+        if path is None:
+            return
+        try:
+            ctx.storage_state(path=path)
+        except Exception as e:
+            logger.error("❌ 错误: 保存 storage_state 失败 %s", e)
+            self._unclaim_storage_save(url)
+
+    async def _save_storage_state_async(self, ctx, url: str):
+        """_save_storage_state 的异步版本"""
+        path = self._claim_storage_save(url)
+        if path is None:
+            return
+        try:
+            await ctx.storage_state(path=path)
+        except Exception as e:
+            logger.error("❌ 错误: 保存 storage_state 失败 %s", e)
+            self._unclaim_storage_save(url)
+
+    async def _get_async_host_context(self, browser, url: str):
+        """获取（必要时创建）域名专用的异步 BrowserContext"""
+        host = urlparse(url).netloc
+        async with self._async_lock:
+            ctx_by_host = self._async_ctx_by_host
+            if host in ctx_by_host:
+                ctx_by_host.move_to_end(host)
+            else:
+                ctx_by_host[host] = await self._new_context_async(
+                    browser, storage_state=self._storage_state_path(host)
+                )
+            # 返回前（仍持有锁）登记占用，防止其他协程在本次抓取期间淘汰该上下文
+            self._async_ctx_refs[host] = self._async_ctx_refs.get(host, 0) + 1
+            await self._evict_idle_async_contexts(ctx_by_host, MAX_HOST_CONTEXTS)
+            return ctx_by_host[host]
+
+    async def _release_async_host_context(self, url: str):
+        """归还域名上下文（保留 Cookie 等状态），最后一个使用者归还时淘汰超出上限的空闲上下文"""
+        host = urlparse(url).netloc
+        async with self._async_lock:
+            self._async_ctx_refs[host] -= 1
+            if self._async_ctx_refs[host] == 0:
+                del self._async_ctx_refs[host]
+                await self._evict_idle_async_contexts(
+                    self._async_ctx_by_host, MAX_HOST_CONTEXTS
+                )
+
+    async def _get_async_viewport_context(self, browser, viewport: ViewportSize):
+        """获取（必要时创建）该视口尺寸缓存的异步 BrowserContext"""
+        key = (viewport["width"], viewport["height"])
+        async with self._async_lock:
+            ctx_by_viewport = self._async_ctx_by_viewport
+            if key in ctx_by_viewport:
+                ctx_by_viewport.move_to_end(key)
+            else:
+                ctx_by_viewport[key] = await self._new_context_async(browser, viewport=viewport)
+            # 返回前（仍持有锁）登记占用，防止其他协程在本次抓取期间淘汰该上下文
+            self._async_ctx_refs[key] = self._async_ctx_refs.get(key, 0) + 1
+            await self._evict_idle_async_contexts(ctx_by_viewport, MAX_VIEWPORT_CONTEXTS)
+            return ctx_by_viewport[key]
+
+    async def _release_async_viewport_context(self, viewport: ViewportSize):
+        """归还视口上下文，最后一个使用者归还时清除 Cookie 并淘汰超出上限的空闲上下文"""
+        key = (viewport["width"], viewport["height"])
+        async with self._async_lock:
+            self._async_ctx_refs[key] -= 1
+            if self._async_ctx_refs[key] == 0:
+                del self._async_ctx_refs[key]
+                # 浏览器断开重启后旧上下文已从缓存中移除，无需清除
+                ctx = self._async_ctx_by_viewport.get(key)
+                if ctx is not None:
+                    # 持有锁清除，避免其他协程在清除过程中取得该上下文
+                    await ctx.clear_cookies()
+                await self._evict_idle_async_contexts(
+                    self._async_ctx_by_viewport, MAX_VIEWPORT_CONTEXTS
+                )
+
+    async def _evict_idle_async_contexts(self, cache: OrderedDict, limit: int):
+        """超出 limit 时按最久未使用顺序关闭缓存中的空闲上下文（调用方需持有 _async_lock）"""
+        for key in list(cache):
+            if len(cache) <= limit:
+                break
+            if key not in self._async_ctx_refs:
+                await cache.pop(key).close()
+
+    def _new_page(
+        self,
+        ctx,
+        viewport_width: int,
+        viewport_height: int,
+        timeout: int,
+        resources: Optional[frozenset[str]] = None,
+    ):
+        """在上下文中新建页面并设置视口、超时和资源拦截"""
+        page = ctx.new_page()
+        if self.host_contexts:
+            # 域名上下文被不同视口的页面共用，视口按页面设置
+            page.set_viewport_size(
+                ViewportSize(width=viewport_width, height=viewport_height)
+            )
+        page.set_default_timeout(timeout)
+        if resources is not None:
+            page.route(
+                "**/*",
+                lambda route: route.continue_()
+                if route.request.resource_type in resources
+                else route.abort(),
+            )
+        return page
 
     def capture(
         self,
@@ -66,9 +868,13 @@ class WebScreenshot:
         full_page: bool = True,
         viewport_width: int = 1920,
         viewport_height: int = 1080,
-        wait_time: int = 3,
+        wait_time: int = 0,
         scroll_delay: float = 0.5,
         timeout: int = 30000,
+        ready_selector: Optional[str] = None,
+        resources: Optional[frozenset[str]] = None,
+        image_format: Literal["png", "jpeg", "webp"] = "png",
+        quality: Optional[int] = None,
     ) -> bool:
         """
         截取网页截图
@@ -79,45 +885,54 @@ class WebScreenshot:
             full_page: 是否截取完整页面（True=长截图，False=仅可视区域）
             viewport_width: 视口宽度
             viewport_height: 视口高度
-            wait_time: 页面加载后等待时间（秒）
+            wait_time: 页面加载后额外等待时间（秒），默认不等待
             scroll_delay: 滚动延迟（秒），用于触发懒加载
             timeout: 页面加载超时时间（毫秒）
+            ready_selector: 页面就绪的标志元素选择器，出现（可见）后即开始截图；
+                            未指定时完整截图会等待网络空闲
+            resources: 允许加载的资源类型白名单（如 SCREENSHOT_RESOURCES），None 表示不拦截
+            image_format: 截图格式 ("png", "jpeg", "webp")；webp 截图宽或高超出
+                          WEBP_MAX_DIMENSION 时改存为同名 .jpg 文件
+            quality: jpeg / webp 质量 (0-100)，默认 DEFAULT_JPEG_QUALITY / DEFAULT_WEBP_QUALITY
 
         Returns:
-            bool: 是否成功
+            bool: 是否成功（截图文件在后台写入，调用 flush() 或 close() 后保证落盘）
         """
+        self._check_owner_thread()
         try:
-            with sync_playwright() as p:
-                browser = self._launch_browser(p)
-                page = browser.new_page(
-                    viewport=ViewportSize(
-                        width=viewport_width, height=viewport_height
-                    )
+            ctx = self._acquire_context(url, viewport_width, viewport_height)
+            try:
+                page = self._new_page(
+                    ctx, viewport_width, viewport_height, timeout, resources
                 )
-                page.set_default_timeout(timeout)
 
                 # 加载页面
-                self._load_page(page, url, wait_time, full_page, scroll_delay)
+                self._load_page(
+                    page, url, wait_time, full_page, scroll_delay, ready_selector
+                )
 
                 # 截图
-                print(f"正在截图: {output_path}")
-                page.screenshot(
-                    path=output_path,
-                    full_page=full_page,
-                    animations="disabled",
-                    scale="device",
-                    type="png",
+                logger.debug("正在截图: %s", output_path)
+                self._write_screenshot(
+                    output_path,
+                    page.screenshot(
+                        **self._screenshot_options(full_page, image_format, quality)
+                    ),
+                    image_format,
+                    quality,
                 )
+                self._save_storage_state(ctx, url)
+            finally:
+                self._release_context(ctx)
 
-                browser.close()
-                print("✅ 截图成功！")
-                return True
+            logger.info("✅ 截图成功！")
+            return True
 
         except PlaywrightTimeout:
-            print(f"❌ 错误: 页面加载超时 ({timeout}ms)")
+            logger.error("❌ 错误: 页面加载超时 (%sms)", timeout)
             return False
         except Exception as e:
-            print(f"❌ 错误: {str(e)}")
+            logger.error("❌ 错误: %s", e)
             return False
 
     def capture_full(
@@ -127,9 +942,16 @@ class WebScreenshot:
         full_page: bool = True,
         viewport_width: int = 1920,
         viewport_height: int = 1080,
-        wait_time: int = 3,
+        wait_time: int = 0,
         scroll_delay: float = 0.5,
         timeout: int = 30000,
+        ready_selector: Optional[str] = None,
+        static_first: bool = False,
+        resources: Optional[frozenset[str]] = None,
+        text_only: bool = False,
+        raw_html: bool = False,
+        image_format: Literal["png", "jpeg", "webp"] = "png",
+        quality: Optional[int] = None,
     ) -> Optional[WebPageContent]:
         """
         一次性获取网页截图和内容（避免重复访问）
@@ -140,53 +962,322 @@ class WebScreenshot:
             full_page: 是否截取完整页面
             viewport_width: 视口宽度
             viewport_height: 视口高度
-            wait_time: 页面加载后等待时间（秒）
+            wait_time: 页面加载后额外等待时间（秒），默认不等待
             scroll_delay: 滚动延迟（秒）
             timeout: 页面加载超时时间（毫秒）
+            ready_selector: 页面就绪的标志元素选择器，出现（可见）后即开始截图；
+                            未指定时完整截图会等待网络空闲
+            static_first: 先用 HTTP GET 获取原始 HTML，若页面为静态页面则直接从中
+                          解析内容，浏览器只负责截图
+            resources: 允许加载的资源类型白名单（如 SCREENSHOT_RESOURCES），None 表示不拦截
+            text_only: 只提取内容不截图（隐含 resources=TEXT_ONLY_RESOURCES 和
+                       full_page=False，返回结果的 screenshot_path 为空字符串）
+            raw_html: html 字段使用服务器返回的原始 HTML，而不是 JS 执行后重新序列化的 DOM
+                      （无法获取响应内容时回退到 DOM）
+            image_format: 截图格式 ("png", "jpeg", "webp")；webp 截图宽或高超出
+                          WEBP_MAX_DIMENSION 时改存为同名 .jpg 文件
+            quality: jpeg / webp 质量 (0-100)，默认 DEFAULT_JPEG_QUALITY / DEFAULT_WEBP_QUALITY
 
         Returns:
             WebPageContent: 包含截图路径和页面内容的数据模型，失败返回 None
+                            （截图文件在后台写入，调用 flush() 或 close() 后保证落盘）
         """
+        self._check_owner_thread()
+        if text_only:
+            output_path = ""
+            resources = TEXT_ONLY_RESOURCES
+            # 不截图也就无需等待网络空闲和滚动触发懒加载
+            full_page = False
+
         try:
-            with sync_playwright() as p:
-                browser = self._launch_browser(p)
-                page = browser.new_page(
-                    viewport=ViewportSize(
-                        width=viewport_width, height=viewport_height
-                    )
+            content = None
+            if static_first:
+                content = self._extract_static(url, output_path, timeout)
+                # 仅需文本且静态解析成功时无需启动浏览器
+                if text_only and content is not None:
+                    return content
+
+            ctx = self._acquire_context(url, viewport_width, viewport_height)
+            try:
+                page = self._new_page(
+                    ctx, viewport_width, viewport_height, timeout, resources
                 )
-                page.set_default_timeout(timeout)
 
                 # 加载页面
-                self._load_page(page, url, wait_time, full_page, scroll_delay)
+                response = self._load_page(
+                    page, url, wait_time, full_page, scroll_delay, ready_selector,
+                    screenshot=not text_only,
+                )
 
                 # 截图
-                print(f"正在截图: {output_path}")
-                page.screenshot(
-                    path=output_path,
-                    full_page=full_page,
-                    animations="disabled",
-                    scale="device",
-                    type="png",
-                )
+                if not text_only:
+                    logger.debug("正在截图: %s", output_path)
+                    output_path, _ = self._write_screenshot(
+                        output_path,
+                        page.screenshot(
+                            **self._screenshot_options(full_page, image_format, quality)
+                        ),
+                        image_format,
+                        quality,
+                    )
 
-                # 提取内容
-                print("正在提取页面内容...")
-                content = self._extract_content(page, output_path)
+                # 提取内容（静态快速通道已解析时跳过）
+                if content is not None:
+                    content.screenshot_path = output_path
+                else:
+                    logger.debug("正在提取页面内容...")
+                    content = self._extract_content(
+                        page, output_path, response if raw_html else None
+                    )
+                self._save_storage_state(ctx, url)
+            finally:
+                self._release_context(ctx)
 
-                browser.close()
-                print("✅ 截图和内容提取成功！")
-                return content
+            logger.info("✅ 截图和内容提取成功！")
+            return content
 
         except PlaywrightTimeout:
-            print(f"❌ 错误: 页面加载超时 ({timeout}ms)")
+            logger.error("❌ 错误: 页面加载超时 (%sms)", timeout)
             return None
         except Exception as e:
-            print(f"❌ 错误: {str(e)}")
+            logger.error("❌ 错误: %s", e)
             return None
 
+    async def capture_full_async(
+        self,
+        url: str,
+        output_path: str,
+        full_page: bool = True,
+        viewport_width: int = 1920,
+        viewport_height: int = 1080,
+        wait_time: int = 0,
+        scroll_delay: float = 0.5,
+        timeout: int = 30000,
+        ready_selector: Optional[str] = None,
+        static_first: bool = False,
+        resources: Optional[frozenset[str]] = None,
+        text_only: bool = False,
+        raw_html: bool = False,
+        image_format: Literal["png", "jpeg", "webp"] = "png",
+        quality: Optional[int] = None,
+    ) -> Optional[WebPageContent]:
+        """
+        capture_full 的异步版本，多个调用可在同一事件循环中并发执行
+
+        参数与返回值同 capture_full。
+        """
+        content, _ = await self._capture_full_async(
+            url,
+            output_path,
+            full_page=full_page,
+            viewport_width=viewport_width,
+            viewport_height=viewport_height,
+            wait_time=wait_time,
+            scroll_delay=scroll_delay,
+            timeout=timeout,
+            ready_selector=ready_selector,
+            static_first=static_first,
+            resources=resources,
+            text_only=text_only,
+            raw_html=raw_html,
+            image_format=image_format,
+            quality=quality,
+        )
+        return content
+
+    async def _capture_full_async(
+        self,
+        url: str,
+        output_path: str,
+        full_page: bool = True,
+        viewport_width: int = 1920,
+        viewport_height: int = 1080,
+        wait_time: int = 0,
+        scroll_delay: float = 0.5,
+        timeout: int = 30000,
+        ready_selector: Optional[str] = None,
+        static_first: bool = False,
+        resources: Optional[frozenset[str]] = None,
+        text_only: bool = False,
+        raw_html: bool = False,
+        image_format: Literal["png", "jpeg", "webp"] = "png",
+        quality: Optional[int] = None,
+    ) -> tuple[Optional[WebPageContent], Optional[Future]]:
+        """capture_full_async 的实现，额外返回本次截图的后台写入任务（未截图时为 None）"""
+        if text_only:
+            output_path = ""
+            resources = TEXT_ONLY_RESOURCES
+            # 不截图也就无需等待网络空闲和滚动触发懒加载
+            full_page = False
+
+        write = None
+        try:
+            content = None
+            if static_first:
+                content = await asyncio.to_thread(
+                    self._extract_static, url, output_path, timeout
+                )
+                # 仅需文本且静态解析成功时无需启动浏览器
+                if text_only and content is not None:
+                    return content, None
+
+            browser = await self._get_async_browser()
+            viewport = ViewportSize(width=viewport_width, height=viewport_height)
+            if self.host_contexts:
+                ctx = await self._get_async_host_context(browser, url)
+            else:
+                ctx = await self._get_async_viewport_context(browser, viewport)
+            page = None
+            try:
+                page = await ctx.new_page()
+                if self.host_contexts:
+                    # 域名上下文被不同视口的页面共用，视口按页面设置
+                    await page.set_viewport_size(viewport)
+                page.set_default_timeout(timeout)
+                if resources is not None:
+                    async def handle_route(route):
+                        if route.request.resource_type in resources:
+                            await route.continue_()
+                        else:
+                            await route.abort()
+
+                    await page.route("**/*", handle_route)
+
+                # 加载页面
+                response = await self._load_page_async(
+                    page, url, wait_time, full_page, scroll_delay, ready_selector,
+                    screenshot=not text_only,
+                )
+                html = None
+                if raw_html and content is None and response is not None:
+                    try:
+                        html = self._decode_body(
+                            await response.body(), response.headers.get("content-type", "")
+                        )
+                    except (PlaywrightError, UnicodeDecodeError):
+                        pass  # 响应内容不可用时回退到 DOM
+
+                # 截图与内容提取并发执行，让浏览器的绘制/编码与提取脚本重叠
+                tasks = []
+                if not text_only:
+                    logger.debug("正在截图: %s", output_path)
+                    tasks.append(page.screenshot(
+                        **self._screenshot_options(full_page, image_format, quality)
+                    ))
+                # 静态快速通道已解析时跳过内容提取
+                if content is None:
+                    logger.debug("正在提取页面内容...")
+                    tasks.append(page.evaluate(EXTRACT_CALL_JS, html is None))
+                results = await asyncio.gather(*tasks)
+
+                if not text_only:
+                    output_path, write = self._write_screenshot(
+                        output_path, results.pop(0), image_format, quality
+                    )
+                if content is not None:
+                    content.screenshot_path = output_path
+                else:
+                    data = results.pop(0)
+                    if html is not None:
+                        data["html"] = html
+                    content = self._build_content(data, output_path)
+                await self._save_storage_state_async(ctx, url)
+            finally:
+                # 上下文保持打开供后续复用，只关闭本次的页面
+                if page is not None:
+                    await page.close()
+                # 视口上下文无人使用时清除 Cookie，避免状态带入下一次抓取
+                if self.host_contexts:
+                    await self._release_async_host_context(url)
+                else:
+                    await self._release_async_viewport_context(viewport)
+
+            logger.info("✅ 截图和内容提取成功！")
+            return content, write
+
+        except PlaywrightTimeout:
+            logger.error("❌ 错误: 页面加载超时 (%sms)", timeout)
+            return None, None
+        except Exception as e:
+            logger.error("❌ 错误: %s", e)
+            return None, None
+
+    def capture_many(
+        self,
+        urls: list[str],
+        output_dir: str,
+        max_concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> list[Optional[WebPageContent]]:
+        """
+        并发截取多个网页的截图和内容（capture_many_async 的同步封装）
+
+        Args:
+            urls: 目标网页 URL 列表
+            output_dir: 截图输出目录，文件按 URL 顺序命名为 00000.png、00001.png ...
+                        （扩展名随 image_format 变化，见 IMAGE_SUFFIXES）
+            max_concurrency: 最大并发页面数（默认 pool_size）
+            **kwargs: 透传给 capture_full_async 的其他参数
+
+        Returns:
+            list[Optional[WebPageContent]]: 与 urls 顺序一致的结果列表，失败项（包括截图
+                                            写入失败的项）为 None，返回时截图已全部落盘
+        """
+        async def run():
+            try:
+                return await self.capture_many_async(
+                    urls, output_dir, max_concurrency, **kwargs
+                )
+            finally:
+                # 事件循环结束后异步浏览器不可再用，随之关闭
+                await self.aclose()
+
+        return asyncio.run(run())
+
+    async def capture_many_async(
+        self,
+        urls: list[str],
+        output_dir: str,
+        max_concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> list[Optional[WebPageContent]]:
+        """
+        在同一个浏览器下并发截取多个网页
+
+        参数与返回值同 capture_many。
+        """
+        if not urls:
+            return []
+
+        suffix = IMAGE_SUFFIXES[kwargs.get("image_format", "png")]
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        semaphore = asyncio.Semaphore(max_concurrency or self.pool_size)
+
+        async def run(i: int, url: str) -> tuple[Optional[WebPageContent], Optional[Future]]:
+            async with semaphore:
+                return await self._capture_full_async(
+                    url, str(out / f"{i:05d}.{suffix}"), **kwargs
+                )
+
+        captured = await asyncio.gather(*(run(i, url) for i, url in enumerate(urls)))
+        # 所有页面处理完后统一等待本次调用的后台写入，写入失败的项视为失败
+        writes = [write for _, write in captured if write is not None]
+        if writes:
+            await asyncio.wait([asyncio.wrap_future(write) for write in writes])
+            self._forget_writes(writes)
+        results = []
+        for content, write in captured:
+            if write is not None and write.exception() is not None:
+                logger.error("❌ 错误: 截图写入失败 %s", write.exception())
+                content = None
+            results.append(content)
+        return results
+
     def _launch_browser(self, playwright):
-        """启动浏览器"""
+        """启动浏览器（指定 cdp_endpoint 时连接已有的 Chromium）"""
+        if self.cdp_endpoint:
+            return playwright.chromium.connect_over_cdp(self.cdp_endpoint)
         if self.browser_type == "firefox":
             return playwright.firefox.launch(headless=self.headless)
         elif self.browser_type == "webkit":
@@ -194,131 +1285,295 @@ class WebScreenshot:
         else:
             return playwright.chromium.launch(headless=self.headless)
 
-    def _load_page(self, page, url: str, wait_time: int, full_page: bool, scroll_delay: float):
-        """加载页面并触发懒加载"""
-        print(f"正在访问: {url}")
-        page.goto(url, wait_until="load")
+    def _load_page(
+        self,
+        page,
+        url: str,
+        wait_time: int,
+        full_page: bool,
+        scroll_delay: float,
+        ready_selector: Optional[str] = None,
+        screenshot: bool = True,
+    ):
+        """
+        加载页面并触发懒加载，返回主文档的响应（可能为 None）
+
+        screenshot 为 False（仅提取文本）时只等待 DOMContentLoaded 和 ready_selector。
+        """
+        logger.debug("正在访问: %s", url)
+        response = page.goto(url, wait_until="domcontentloaded")
+
+        # 等待页面就绪：优先等待指定元素，完整截图时退而等待网络空闲，
+        # 视口截图至少等到 load 事件，保证首屏图片和字体已加载
+        if ready_selector:
+            page.wait_for_selector(ready_selector, state="visible")
+        elif full_page:
+            try:
+                page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT)
+            except PlaywrightTimeout:
+                pass  # 超时也继续，不阻断流程
+        elif screenshot:
+            page.wait_for_load_state("load")
 
-        # 额外等待时间
+        # 额外等待时间（兼容旧用法）
         if wait_time > 0:
-            print(f"等待 {wait_time} 秒...")
+            logger.debug("等待 %s 秒...", wait_time)
             time.sleep(wait_time)
 
         # 如果需要完整截图，模拟滚动以触发懒加载
         if full_page and scroll_delay > 0:
-            print("触发懒加载内容...")
+            logger.debug("触发懒加载内容...")
             self._trigger_lazy_load(page, scroll_delay)
 
-    def _extract_content(self, page, screenshot_path: str) -> WebPageContent:
+        return response
+
+    async def _load_page_async(
+        self,
+        page,
+        url: str,
+        wait_time: int,
+        full_page: bool,
+        scroll_delay: float,
+        ready_selector: Optional[str] = None,
+        screenshot: bool = True,
+    ):
+        """_load_page 的异步版本"""
+        logger.debug("正在访问: %s", url)
+        response = await page.goto(url, wait_until="domcontentloaded")
+
+        # 等待页面就绪：优先等待指定元素，完整截图时退而等待网络空闲，
+        # 视口截图至少等到 load 事件，保证首屏图片和字体已加载
+        if ready_selector:
+            await page.wait_for_selector(ready_selector, state="visible")
+        elif full_page:
+            try:
+                await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT)
+            except PlaywrightTimeout:
+                pass  # 超时也继续，不阻断流程
+        elif screenshot:
+            await page.wait_for_load_state("load")
+
+        # 额外等待时间（兼容旧用法）
+        if wait_time > 0:
+            logger.debug("等待 %s 秒...", wait_time)
+            await asyncio.sleep(wait_time)
+
+        # 如果需要完整截图，模拟滚动以触发懒加载
+        if full_page and scroll_delay > 0:
+            logger.debug("触发懒加载内容...")
+            await self._trigger_lazy_load_async(page, scroll_delay)
+
+        return response
+
+    def _extract_content(self, page, screenshot_path: str, response=None) -> WebPageContent:
         """
-        从页面提取所有内容
+        从页面提取所有内容（单次 page.evaluate 完成，避免逐元素往返）
 
         Args:
             page: Playwright 页面对象
             screenshot_path: 截图保存路径
+            response: 主文档响应，提供时 html 字段使用响应原文，跳过 DOM 序列化
 
         Returns:
             WebPageContent: 包含页面所有内容的数据模型
         """
-        # 基础信息
-        url = page.url
-        title = page.title()
+        html = None
+        if response is not None:
+            try:
+                html = self._decode_body(
+                    response.body(), response.headers.get("content-type", "")
+                )
+            except (PlaywrightError, UnicodeDecodeError):
+                pass  # 响应内容不可用时回退到 DOM
 
-        # 文本内容
-        text_content = page.inner_text('body')
-        html = page.content()
+        data = page.evaluate(EXTRACT_CALL_JS, html is None)
+        if html is not None:
+            data["html"] = html
+        return self._build_content(data, screenshot_path)
 
-        # Meta 标签
-        meta = self._extract_meta(page)
+    @staticmethod
+    def _decode_body(body: bytes, content_type: str) -> str:
+        """
+        按响应头或 <meta> 声明的编码解码 HTML 响应体
 
-        # 图片信息
-        images = self._extract_images(page)
+        Response.text() 固定按 UTF-8 严格解码，GBK、Shift_JIS 等页面会抛出
+        UnicodeDecodeError；这里未声明编码时按 UTF-8 解码，非法字节替换为 U+FFFD，
+        编码名无法识别时同样回退到 UTF-8。
+        """
+        match = CONTENT_TYPE_CHARSET_RE.search(content_type) or META_CHARSET_RE.search(body[:1024])
+        charset = "utf-8"
+        if match is not None:
+            charset = match.group(1)
+            if isinstance(charset, bytes):
+                charset = charset.decode("ascii")
+            charset = CHARSET_ALIASES.get(charset.lower(), charset)
+        try:
+            return body.decode(charset, errors="replace")
+        except LookupError:
+            return body.decode("utf-8", errors="replace")
+
+    def _build_content(self, data: dict, screenshot_path: str) -> WebPageContent:
+        """由 EXTRACT_JS 返回的数据构建 WebPageContent"""
+        return self._make_content(
+            data["images"],
+            screenshot_path=screenshot_path,
+            url=data["url"],
+            title=data["title"],
+            text_content=data["text"],
+            html=data["html"],
+            meta=data["meta"],
+            headings=data["headings"],
+        )
 
-        # 标题结构
-        headings = self._extract_headings(page)
+    def _make_content(self, images: list[dict], **fields) -> WebPageContent:
+        """
+        由图片记录和其余字段构建 WebPageContent
 
-        return WebPageContent(
-            screenshot_path=screenshot_path,
-            url=url,
-            title=title,
-            text_content=text_content,
-            html=html,
-            meta=meta,
-            images=images,
-            headings=headings,
+        开启 validated 时由 msgspec 在 C 层一次性校验整个图片列表，再在 API 边界
+        包装为 ImageInfo；否则直接 model_construct 跳过校验。
+        """
+        if self.validated:
+            return WebPageContent.from_fast(
+                msgspec.convert(images, list[ImageInfoFast]), **fields
+            )
+        return WebPageContent.model_construct(
+            images=[ImageInfo.model_construct(**img) for img in images],
+            **fields,
         )
 
-    def _extract_meta(self, page) -> dict:
-        """提取 meta 标签信息"""
-        meta = {}
+    def _extract_static(self, url: str, screenshot_path: str, timeout: int) -> Optional[WebPageContent]:
+        """
+        通过 HTTP GET 获取原始 HTML 并解析内容（不执行 JS）
 
-        # 常见 meta 标签
-        meta_names = ['description', 'keywords', 'author', 'viewport']
-        for name in meta_names:
-            try:
-                element = page.query_selector(f'meta[name="{name}"]')
-                if element:
-                    content = element.get_attribute('content')
-                    if content:
-                        meta[name] = content
-            except Exception:
-                pass
+        Args:
+            url: 目标网页 URL
+            screenshot_path: 截图保存路径
+            timeout: 请求超时时间（毫秒）
 
-        # Open Graph 标签
-        og_tags = page.query_selector_all('meta[property^="og:"]')
-        for tag in og_tags:
-            try:
-                prop = tag.get_attribute('property')
-                content = tag.get_attribute('content')
-                if prop and content:
-                    meta[prop] = content
-            except Exception:
-                pass
+        Returns:
+            WebPageContent: 页面为静态页面时返回解析结果，否则返回 None（回退到浏览器提取）
+        """
+        try:
+            resp = self._get_http().get(url, timeout=timeout / 1000)
+            resp.raise_for_status()
+        except httpx.HTTPError:
+            return None
 
-        return meta
+        if "html" not in resp.headers.get("content-type", ""):
+            return None
 
-    def _extract_images(self, page) -> list[ImageInfo]:
-        """提取所有图片信息"""
-        images = []
-        img_elements = page.query_selector_all('img')
+        html = resp.text
+        tree = LexborHTMLParser(html)
 
-        for img in img_elements:
-            try:
-                src = img.get_attribute('src') or ''
-                # 只保存有 src 的图片
-                if src:
-                    images.append(ImageInfo(
-                        src=src,
-                        alt=img.get_attribute('alt') or '',
-                        width=img.get_attribute('width') or '',
-                        height=img.get_attribute('height') or '',
-                    ))
-            except Exception:
-                pass
+        # 存在 <noscript> 通常意味着页面依赖 JS 渲染
+        if tree.css_first("noscript") is not None:
+            return None
 
-        return images
+        content = self._parse_tree(tree, html, str(resp.url), screenshot_path)
 
-    def _extract_headings(self, page) -> dict:
-        """提取标题结构 (h1-h6)"""
-        headings = {}
+        # 标题或正文为空说明内容需要 JS 渲染
+        if not content.title or len(content.text_content) < MIN_STATIC_TEXT_LENGTH:
+            return None
 
-        for level in range(1, 7):
-            tag = f'h{level}'
-            elements = page.query_selector_all(tag)
-            texts = []
+        logger.debug("已从静态 HTML 提取页面内容")
+        return content
 
-            for element in elements:
-                try:
-                    text = element.inner_text().strip()
-                    if text:
-                        texts.append(text)
-                except Exception:
-                    pass
+    def parse_html(self, html: str, url: str = "", screenshot_path: str = "") -> WebPageContent:
+        """
+        解析 HTML 源码（不执行 JS），可用于离线处理已保存的 WebPageContent.html
 
-            if texts:
-                headings[tag] = texts
+        Args:
+            html: HTML 源码
+            url: 页面 URL
+            screenshot_path: 对应的截图路径
+
+        Returns:
+            WebPageContent: 解析出的页面内容
+        """
+        return self._parse_tree(LexborHTMLParser(html), html, url, screenshot_path)
+
+    def _parse_tree(self, tree: LexborHTMLParser, html: str, url: str, screenshot_path: str) -> WebPageContent:
+        """从 selectolax 解析树提取内容，每类元素只做一次 CSS 查询"""
+        title_node = tree.css_first("title")
+        title = title_node.text(strip=True) if title_node is not None else ""
+
+        # 常见 meta 标签 + Open Graph 标签
+        meta = {
+            attrs.get('name') or attrs.get('property'): attrs['content']
+            for attrs in (
+                node.attributes
+                for node in tree.css(
+                    'meta[name="description"], meta[name="keywords"], '
+                    'meta[name="author"], meta[name="viewport"], meta[property^="og:"]'
+                )
+            )
+            if attrs.get('content')
+        }
 
-        return headings
+        # 只保存有 src 的图片
+        images = [
+            {
+                'src': attrs['src'],
+                'alt': attrs.get('alt') or '',
+                'width': attrs.get('width') or '',
+                'height': attrs.get('height') or '',
+            }
+            for attrs in (node.attributes for node in tree.css('img'))
+            if attrs.get('src')
+        ]
+
+        headings = {}
+        for node in tree.css('h1, h2, h3, h4, h5, h6'):
+            text = self._block_text(node).replace('\n', ' ')
+            if text:
+                headings.setdefault(node.tag, []).append(text)
+        headings = {tag: headings[tag] for tag in sorted(headings)}
+
+        # 正文文本（去掉脚本和样式）
+        tree.strip_tags(['script', 'style', 'template'])
+        text_content = self._block_text(tree.body) if tree.body is not None else ""
+
+        return self._make_content(
+            images,
+            screenshot_path=screenshot_path,
+            url=url,
+            title=title,
+            text_content=text_content,
+            html=html,
+            meta=meta,
+            headings=headings,
+        )
+
+    @staticmethod
+    def _block_text(node) -> str:
+        """
+        拼接节点下的文本：行内元素的文本直接相连，块级元素前后换行，
+        行内连续空白压缩为一个空格并去掉空行
+        """
+        parts = []
+        # 显式栈代替递归，避免深层嵌套的 DOM 超出递归深度；字符串项为块级元素的结束换行
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+                continue
+            if item.is_text_node:
+                # 源码中的换行等空白不代表分行
+                parts.append(WHITESPACE_RE.sub(' ', item.text_content))
+                continue
+            if not item.is_element_node:
+                continue  # 注释等节点
+            if item.tag in BLOCK_TAGS:
+                parts.append('\n')
+                stack.append('\n')
+            child = item.last_child
+            while child is not None:
+                stack.append(child)
+                child = child.prev
+
+        lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
 
     def _trigger_lazy_load(self, page, delay: float, max_scrolls: int = 50):
         """
@@ -329,31 +1584,22 @@ class WebScreenshot:
             delay: 每次滚动的延迟时间
             max_scrolls: 最大滚动次数，防止无限滚动
         """
-        # 获取页面总高度
-        total_height = page.evaluate("document.body.scrollHeight")
-        viewport_height = page.viewport_size["height"]
+        # 整个滚动循环在页面内执行，只需一次 evaluate 往返
+        page.evaluate(LAZY_LOAD_JS, [delay * 1000, max_scrolls, LAZY_IMAGE_WAIT_STEPS])
 
-        # 分步滚动
-        current_position = 0
-        scroll_count = 0
-        while current_position < total_height and scroll_count < max_scrolls:
-            page.evaluate(f"window.scrollTo(0, {current_position})")
-            time.sleep(delay)
-            current_position += viewport_height
-            scroll_count += 1
-
-            # 重新获取高度（内容可能动态加载）
-            new_height = page.evaluate("document.body.scrollHeight")
-            if new_height > total_height:
-                total_height = new_height
+        # 等待网络空闲，确保所有资源加载完成
+        try:
+            page.wait_for_load_state("networkidle", timeout=10000)
+        except Exception:
+            pass  # 超时也继续，不阻断流程
 
-        # 滚动回顶部
-        page.evaluate("window.scrollTo(0, 0)")
-        time.sleep(delay)
+    async def _trigger_lazy_load_async(self, page, delay: float, max_scrolls: int = 50):
+        """_trigger_lazy_load 的异步版本"""
+        await page.evaluate(LAZY_LOAD_JS, [delay * 1000, max_scrolls, LAZY_IMAGE_WAIT_STEPS])
 
         # 等待网络空闲，确保所有资源加载完成
         try:
-            page.wait_for_load_state("networkidle", timeout=10000)
+            await page.wait_for_load_state("networkidle", timeout=10000)
         except Exception:
             pass  # 超时也继续，不阻断流程
 
@@ -361,58 +1607,59 @@ class WebScreenshot:
 def main():
     """示例：多种使用场景"""
 
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # 创建输出目录
     output_dir = Path("screenshots")
     output_dir.mkdir(exist_ok=True)
 
-    screenshot = WebScreenshot(headless=True, browser_type="chromium")
-
-    # 示例1: 只截图（原有功能）
-    # url = "https://example.com"
-    # screenshot.capture(
-    #     url=url,
-    #     output_path=str(output_dir / "example_screenshot.png"),
-    #     full_page=True,
-    # )
-
-    # 示例2: 一次性获取截图和内容（推荐，节省资源）
-    url = "https://example.com"
-    url = "https://www.linkedin.com/in/andrewyng/"
-    result = screenshot.capture_full(
-        url=url,
-        output_path=str(output_dir / f"example_full_{int(time.time())}.png"),
-        full_page=True,
-    )
-
-    if result:
-        print("\n" + "="*60)
-        print("页面信息摘要:")
-        print("="*60)
-        print(f"URL: {result.url}")
-        print(f"标题: {result.title}")
-        print(f"截图: {result.screenshot_path}")
-        print(f"\nMeta标签: {len(result.meta)} 个")
-        for key, value in result.meta.items():
-            print(f"  - {key}: {value[:100]}..." if len(value) > 100 else f"  - {key}: {value}")
-        print(f"\n图片数量: {len(result.images)} 张")
-        if result.images:
-            print("  前3张图片:")
-            for img in result.images[:3]:
-                print(f"    - {img.src[:80]}..." if len(img.src) > 80 else f"    - {img.src}")
-        print(f"\n标题结构:")
-        for tag, texts in result.headings.items():
-            print(f"  {tag.upper()}: {len(texts)} 个")
-            for text in texts[:3]:  # 只显示前3个
-                print(f"    - {text}")
-        print(f"\n文本内容长度: {len(result.text_content)} 字符")
-        print(f"文本内容预览:\n{result.text_content[:300]}...")
-        print("="*60)
-
-        # 演示: 可以轻松转换为 JSON 或字典
-        # print("\n转换为字典:")
-        # print(result.model_dump())
-        # print("\n转换为 JSON:")
-        # print(result.model_dump_json(indent=2))
+    with WebScreenshot(headless=True, browser_type="chromium") as screenshot:
+        # 示例1: 只截图（原有功能）
+        # url = "https://example.com"
+        # screenshot.capture(
+        #     url=url,
+        #     output_path=str(output_dir / "example_screenshot.png"),
+        #     full_page=True,
+        # )
+
+        # 示例2: 一次性获取截图和内容（推荐，节省资源）
+        url = "https://example.com"
+        url = "https://www.linkedin.com/in/andrewyng/"
+        result = screenshot.capture_full(
+            url=url,
+            output_path=str(output_dir / f"example_full_{int(time.time())}.png"),
+            full_page=True,
+        )
+
+        if result:
+            logger.info("\n" + "=" * 60)
+            logger.info("页面信息摘要:")
+            logger.info("=" * 60)
+            logger.info("URL: %s", result.url)
+            logger.info("标题: %s", result.title)
+            logger.info("截图: %s", result.screenshot_path)
+            logger.info("\nMeta标签: %d 个", len(result.meta))
+            for key, value in result.meta.items():
+                logger.info("  - %s: %s", key, value[:100] + "..." if len(value) > 100 else value)
+            logger.info("\n图片数量: %d 张", len(result.images))
+            if result.images:
+                logger.info("  前3张图片:")
+                for img in result.images[:3]:
+                    logger.info("    - %s", img.src[:80] + "..." if len(img.src) > 80 else img.src)
+            logger.info("\n标题结构:")
+            for tag, texts in result.headings.items():
+                logger.info("  %s: %d 个", tag.upper(), len(texts))
+                for text in texts[:3]:  # 只显示前3个
+                    logger.info("    - %s", text)
+            logger.info("\n文本内容长度: %d 字符", len(result.text_content))
+            logger.info("文本内容预览:\n%s...", result.text_content[:300])
+            logger.info("=" * 60)
+
+            # 演示: 可以轻松转换为 JSON 或字典
+            # logger.info("\n转换为字典:")
+            # logger.info("%s", result.model_dump())
+            # logger.info("\n转换为 JSON:")
+            # logger.info("%s", result.model_dump_json(indent=2))
 
 
 if __name__ == "__main__":